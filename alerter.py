@@ -1,65 +1,68 @@
 # alerter.py
-import time
 import os
+import re
+import signal
 from datetime import datetime
+from watchdog.observers import Observer
+from watchdog.events import PatternMatchingEventHandler
 
 
 # Configuration: File paths and operational parameters
 DRIFT_DETECTOR_LOG_FILENAME = "generated_files/drift_detector_output.log"
 ALERTS_LOG_FILENAME = "generated_files/alerts.log"
-CHECK_INTERVAL_SECONDS = 10  # How often to check for new drift messages
 
 
-# To keep track of the last processed line number in the drift detector log
-last_processed_line_number = 0
+# Matches both drift message forms in one pass. The detail groups are optional
+# so that a malformed message still produces a fallback alert.
+_DRIFT_RE = re.compile(
+    r"(?P<data>Data drift detected for feature:)\s*(?:(?P<feat>\S+)\s*\(PSI:\s*(?P<psi>[0-9.]+))?"
+    r"|(?P<concept>Concept drift detected!? MSE)\s*(?:\((?P<mse>[0-9.]+)\))?"
+)
 
+# Byte offset into the drift detector log up to which lines have been processed
+last_offset = 0
 
-def create_alert_message(drift_log_line):
+
+def create_alert_message(drift_log_line, timestamp=None):
     """
     Creates a formatted alert message from a drift detector log line.
     Returns the alert message string or None if the line doesn't indicate a notable drift.
     """
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    match = _DRIFT_RE.search(drift_log_line)
+    # Add more alternatives to _DRIFT_RE if drift_detector.py logs other types of critical alerts
+    if match is None:
+        return None  # Not a line we want to generate an alert for
+
+    if timestamp is None:
+        timestamp = datetime.utcnow().isoformat() + "Z"
     alert_prefix = f"{timestamp} - ALERT: "
 
     # Standardize the drift message for the alert log
-    if "Data drift detected for feature:" in drift_log_line:
+    if match.group("data"):
         # Example: "Data drift detected for feature: latency_ms (PSI: 0.1234 > 0.1)"
-        # We want to capture the core information.
-        try:
-            # Extract relevant parts
-            parts = drift_log_line.split("Data drift detected for feature:")[1].split("(PSI:")
-            feature = parts[0].strip()
-            psi_info = parts[1].split(">")[0].strip()  # Get just the PSI value
-            return f"{alert_prefix}Data drift detected for feature '{feature}' (PSI: {psi_info})."
-        except IndexError:
-            # Fallback if parsing fails
-            return f"{alert_prefix}Data drift detected. Details: {drift_log_line.strip()}"
-
-    elif "Concept drift detected MSE" in drift_log_line:
-        # Example: "Concept drift detected MSE (12.3456) exceeds threshold (10.0)"
-        try:
-            mse_info = drift_log_line.split("MSE (")[1].split(")")[0].strip()
-            return f"{alert_prefix}Concept drift detected (MSE: {mse_info})."
-        except IndexError:
-            # Fallback if parsing fails
-            return f"{alert_prefix}Concept drift detected. Details: {drift_log_line.strip()}"
-
-    # Add more conditions here if drift_detector.py logs other types of critical alerts
-
-    return None  # Not a line we want to generate an alert for
-
-
-def write_to_alerts_log(message):
+        if match.group("feat"):
+            return f"{alert_prefix}Data drift detected for feature '{match.group('feat')}' (PSI: {match.group('psi')})."
+        # Fallback if parsing fails
+        return f"{alert_prefix}Data drift detected. Details: {drift_log_line.strip()}"
+
+    # Example: "Concept drift detected! MSE (12.3456) exceeds threshold (10.0)"
+    if match.group("mse"):
+        return f"{alert_prefix}Concept drift detected (MSE: {match.group('mse')})."
+    # Fallback if parsing fails
+    return f"{alert_prefix}Concept drift detected. Details: {drift_log_line.strip()}"
+
+
+def write_to_alerts_log(messages):
     """
-    Appends the given alert message to the ALERTS_LOG_FILENAME.
+    Appends the given alert messages to the ALERTS_LOG_FILENAME in a single write.
     """
+    if not messages:
+        return
     try:
-        # Ensure the directory for the log file exists
-        os.makedirs(os.path.dirname(ALERTS_LOG_FILENAME), exist_ok=True)
-        with open(ALERTS_LOG_FILENAME, "a") as f:
-            f.write(message + "\n")
-        print(f"Alert logged: {message}")
+        with open(ALERTS_LOG_FILENAME, "a", buffering=1 << 16) as f:
+            f.write("\n".join(messages) + "\n")
+        for message in messages:
+            print(f"Alert logged: {message}")
     except Exception as e:
         print(f"Error writing to alerts log '{ALERTS_LOG_FILENAME}': {e}")
 
@@ -69,47 +72,71 @@ def check_for_new_drift_events():
     Checks the drift detector log for new drift events since the last check
     and logs alerts if any are found.
     """
-    global last_processed_line_number
-    new_alerts_generated = False
+    global last_offset
+    alerts = []
     try:
         # Check if the drift detector log file exists and is not empty
         if not os.path.exists(DRIFT_DETECTOR_LOG_FILENAME):
             print(f"Drift detector log file {DRIFT_DETECTOR_LOG_FILENAME} not found. It will be created when drift_detector.py detects drift")
             return False
 
-        if os.path.getsize(DRIFT_DETECTOR_LOG_FILENAME) == 0:
+        size = os.path.getsize(DRIFT_DETECTOR_LOG_FILENAME)
+        if size == 0:
             print(f"Drift detector log file {DRIFT_DETECTOR_LOG_FILENAME} is empty.")
             return False
 
-        with open(DRIFT_DETECTOR_LOG_FILENAME, "r") as f:
-            lines = f.readlines()
-        current_line_count = len(lines)
+        if size < last_offset:
+            # The log was truncated or rotated, start again from the beginning
+            print(f"Drift detector log file {DRIFT_DETECTOR_LOG_FILENAME} shrank. Re-reading from the start.")
+            last_offset = 0
+
+        if size == last_offset:
+            return False
 
-        if current_line_count > last_processed_line_number:
-            # Process new lines
-            new_lines = lines[last_processed_line_number:]
-            print(f"Found {len(new_lines)} new lines in {DRIFT_DETECTOR_LOG_FILENAME}.")
-            for line in new_lines:
-                stripped_line = line.strip()
+        # One timestamp for every alert raised by this check
+        timestamp = datetime.utcnow().isoformat() + "Z"
+
+        # Only read the bytes appended since the last check
+        with open(DRIFT_DETECTOR_LOG_FILENAME, "rb") as f:
+            f.seek(last_offset)
+            new_line_count = 0
+            while True:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    # Leave a partially written last line for the next check
+                    break
+                new_line_count += 1
+                last_offset += len(line)
+                stripped_line = line.decode("utf-8", errors="replace").strip()
                 if stripped_line:  # Ensure line is not empty
-                    alert_message = create_alert_message(stripped_line)
+                    alert_message = create_alert_message(stripped_line, timestamp)
                     if alert_message:
-                        write_to_alerts_log(alert_message)
-                        new_alerts_generated = True
-            last_processed_line_number = current_line_count
+                        alerts.append(alert_message)
+        if new_line_count:
+            print(f"Found {new_line_count} new lines in {DRIFT_DETECTOR_LOG_FILENAME}.")
+        write_to_alerts_log(alerts)
     except FileNotFoundError:
         print(f"Drift detector log file {DRIFT_DETECTOR_LOG_FILENAME} not found. It will be created when drift_detector.py detects drift")
         return False
     except Exception as e:
         print(f"Error reading drift detector log '{DRIFT_DETECTOR_LOG_FILENAME}': {e}")
         return False
-    return new_alerts_generated
+    return bool(alerts)
+
+
+class DriftLogHandler(PatternMatchingEventHandler):
+    """
+    Watchdog handler that checks for new drift events whenever the drift detector log is modified.
+    """
+
+    def on_modified(self, event):
+        check_for_new_drift_events()
 
 
 def main():
     """
     Main function for the alerter.
-    Continuously monitors the drift detector log and generates alerts.
+    Watches the drift detector log for modifications and generates alerts.
     """
     print("Alerter service started. Monitoring for drift detection events...")
 
@@ -122,16 +149,27 @@ def main():
         print(f"Error creating log directories: {e}. Please ensure the program has write permissions.")
         return  # Exit if directories cannot be created
 
-    while True:
-        try:
-            check_for_new_drift_events()
-            time.sleep(CHECK_INTERVAL_SECONDS)
-        except KeyboardInterrupt:
-            print("Alerter service shutting down due to KeyboardInterrupt.")
-            break
-        except Exception as e:
-            print(f"An unexpected error occurred in the alerter main loop: {e}")
-            time.sleep(CHECK_INTERVAL_SECONDS * 2)
+    # Pick up anything logged before the alerter started
+    check_for_new_drift_events()
+
+    # Only wake up when the drift detector log is modified, instead of polling
+    event_handler = DriftLogHandler(
+        patterns=[f"*{os.path.basename(DRIFT_DETECTOR_LOG_FILENAME)}"],
+        ignore_directories=True,
+    )
+
+    observer = Observer()
+    observer.schedule(event_handler, os.path.dirname(DRIFT_DETECTOR_LOG_FILENAME), recursive=False)
+
+    def shutdown(sig, frame):
+        print("Alerter service shutting down.")
+        observer.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    observer.start()
+    observer.join()
 
 
 if __name__ == "__main__":
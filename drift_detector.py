@@ -2,11 +2,14 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 import time
-from datetime import datetime
+import signal
+import logging
+import logging.handlers
+from datetime import datetime, timezone
 from scipy.stats import kstest
 from sklearn.metrics import mean_squared_error
-import datetime
 
 
 # Define consistent file paths
@@ -24,17 +27,29 @@ DRIFT_THRESHOLD_PSI = 0.1  # Threshold for Population Stability Index
 DRIFT_CHECK_INTERVAL = 30  # Check for drift every 30 seconds
 PERFORMANCE_EVALUATION_INTERVAL = 60  # Evaluate performance every 60 seconds
 CONCEPT_DRIFT_MSE_THRESHOLD = 10.0  # Threshold for MSE increase
+LOG_BUFFER_CAPACITY = 32  # Routine log records are written to the file in batches of this size
 
+# Buffer routine messages and write them together; warnings (drift detections)
+# and errors flush the buffer immediately so the alerter sees them without delay
+_log_file_handler = logging.FileHandler(DRIFT_LOG_FILENAME, mode="a", encoding="utf-8")
+_log_buffer_handler = logging.handlers.MemoryHandler(
+    LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=_log_file_handler
+)
+logger = logging.getLogger("drift_detector")
+logger.setLevel(logging.INFO)
+logger.addHandler(_log_buffer_handler)
+logger.propagate = False
 
-def write_to_log(message):
+
+def write_to_log(message, level=logging.INFO):
     """Writes a message to the drift detector log file."""
     try:
-        timestamp = datetime.datetime.now(datetime.UTC).isoformat() + 'Z'
+        timestamp = datetime.now(timezone.utc).isoformat()
         log_message = f"{timestamp} - {message}"
         
-        with open(DRIFT_LOG_FILENAME, "a") as f:
-            f.write(log_message + "\n")
-        print(log_message)
+        # The orchestrator redirects stdout into this same file, so the message is
+        # not also printed; that copy would arrive late and raise duplicate alerts
+        logger.log(level, log_message)
     except Exception as e:
         print(f"Error writing to log file: {e}")
 
@@ -60,7 +75,7 @@ def calculate_psi(expected, actual, num_buckets=10):
                 psi_val += (actual_counts[i] - expected_counts[i]) * np.log(actual_counts[i] / expected_counts[i])
         return psi_val
     except Exception as e:
-        write_to_log(f"Error calculating PSI: {e}")
+        write_to_log(f"Error calculating PSI: {e}", logging.ERROR)
         return 0
 
 
@@ -81,7 +96,7 @@ def detect_data_drift(baseline_df, current_df, feature_columns, threshold=DRIFT_
             drift_detected[col] = psi > threshold
             
             if drift_detected[col]:
-                write_to_log(f"Data drift detected for feature: {col} (PSI: {psi:.4f} > {threshold})")
+                write_to_log(f"Data drift detected for feature: {col} (PSI: {psi:.4f} > {threshold})", logging.WARNING)
                 
     return any(drift_detected.values())
 
@@ -105,9 +120,9 @@ def load_predictions():
                         prediction = float(parts[2].split(": ")[1].replace("%", ""))
                         predictions.append({"timestamp": timestamp_str, "cell_id": cell_id, "prediction": prediction})
                     except Exception as e:
-                        write_to_log(f"Error parsing prediction line: {line.strip()}, error: {e}")
+                        write_to_log(f"Error parsing prediction line: {line.strip()}, error: {e}", logging.ERROR)
     except Exception as e:
-        write_to_log(f"Error loading predictions: {e}")
+        write_to_log(f"Error loading predictions: {e}", logging.ERROR)
         
     predictions_df = pd.DataFrame(predictions)
     if not predictions_df.empty and 'timestamp' in predictions_df.columns:
@@ -136,7 +151,7 @@ def simulate_ground_truth(df):
         
         return result_df
     except Exception as e:
-        write_to_log(f"Error simulating ground truth: {e}")
+        write_to_log(f"Error simulating ground truth: {e}", logging.ERROR)
         return df
 
 
@@ -184,12 +199,12 @@ def detect_concept_drift(predictions_df, original_features_df, threshold=CONCEPT
         
         # Detect concept drift if MSE exceeds threshold
         if mse > threshold:
-            write_to_log(f"Concept drift detected! MSE ({mse:.4f}) exceeds threshold ({threshold})")
+            write_to_log(f"Concept drift detected! MSE ({mse:.4f}) exceeds threshold ({threshold})", logging.WARNING)
             return True
             
         return False
     except Exception as e:
-        write_to_log(f"Error detecting concept drift: {e}")
+        write_to_log(f"Error detecting concept drift: {e}", logging.ERROR)
         return False
 
 
@@ -211,7 +226,7 @@ def load_processed_features(filename=INPUT_FEATURES_FILENAME):
             
         return df
     except Exception as e:
-        write_to_log(f"Error loading processed features: {e}")
+        write_to_log(f"Error loading processed features: {e}", logging.ERROR)
         return None
 
 
@@ -238,7 +253,7 @@ def main():
                     baseline_df.to_csv(BASELINE_DATA_FILENAME, index=False)
                     write_to_log(f"Baseline data saved to {BASELINE_DATA_FILENAME}")
                 except Exception as e:
-                    write_to_log(f"Error saving baseline data: {e}")
+                    write_to_log(f"Error saving baseline data: {e}", logging.ERROR)
             else:
                 write_to_log("Waiting for initial data to establish baseline...")
                 time.sleep(10)  # Wait before retrying
@@ -273,9 +288,11 @@ def main():
             time.sleep(DRIFT_CHECK_INTERVAL)
             
         except Exception as e:
-            write_to_log(f"Unexpected error in drift detector: {e}")
+            write_to_log(f"Unexpected error in drift detector: {e}", logging.ERROR)
             time.sleep(DRIFT_CHECK_INTERVAL)  # Continue despite errors
 
 
 if __name__ == "__main__":
+    # Exit normally on SIGTERM from the orchestrator so buffered log records are flushed
+    signal.signal(signal.SIGTERM, lambda sig, frame: sys.exit(0))
     main()
@@ -4,6 +4,7 @@ import time
 import os
 import sys
 import signal
+import select
 import psutil
 
 # Define scripts and their dependencies
@@ -31,7 +32,42 @@ scripts = [
 # Global variables to track processes and their states
 processes = {}
 script_states = {script["name"]: "pending" for script in scripts}
-start_times = {}
+
+# Launch plan: dependents of each script, how many of its dependencies have not
+# started yet, and when scripts whose dependencies have all started may launch
+scripts_by_name = {script["name"]: script for script in scripts}
+dependents = {script["name"]: [] for script in scripts}
+unstarted_dependencies = {}
+launch_times = {}
+
+# SIGCHLD and select() on pipes are POSIX-only; elsewhere (Windows) scripts are polled
+CHILD_SIGNALS_SUPPORTED = hasattr(signal, "SIGCHLD")
+POLL_INTERVAL_SECONDS = 5  # How often scripts are polled when SIGCHLD is unavailable
+
+# Self-pipe written to by the interpreter whenever a signal (e.g. SIGCHLD) arrives
+if CHILD_SIGNALS_SUPPORTED:
+    _wakeup_read_fd, _wakeup_write_fd = os.pipe()
+    os.set_blocking(_wakeup_read_fd, False)
+    os.set_blocking(_wakeup_write_fd, False)
+
+def pid_filename(name):
+    """Path of the PID file the UI reads to tell whether a script is running."""
+    return os.path.join("generated_files", f"{name}.pid")
+
+def write_pid_file(name, pid):
+    try:
+        with open(pid_filename(name), "w") as f:
+            f.write(str(pid))
+    except Exception as e:
+        print(f"Failed to write PID file for {name}: {e}")
+
+def remove_pid_file(name):
+    try:
+        os.remove(pid_filename(name))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Failed to remove PID file for {name}: {e}")
 
 # Ensure the generated_files directory exists
 def ensure_directories_exist():
@@ -44,9 +80,42 @@ def ensure_directories_exist():
         print(f"Failed to create necessary directories: {e}")
         return False
 
+def build_launch_plan():
+    """
+    Records the dependents of every script and schedules the scripts without
+    dependencies. Returns the scripts in topological order; scripts in a
+    dependency cycle or depending on an unknown script are left out.
+    """
+    for script_info in scripts:
+        unstarted_dependencies[script_info["name"]] = len(script_info["dependencies"])
+        for dep in script_info["dependencies"]:
+            if dep in dependents:
+                dependents[dep].append(script_info["name"])
+
+    order = []
+    remaining = dict(unstarted_dependencies)
+    queue = [name for name, count in remaining.items() if count == 0]
+    while queue:
+        name = queue.pop(0)
+        order.append(name)
+        for child in dependents[name]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                queue.append(child)
+
+    for name in order:
+        if unstarted_dependencies[name] == 0:
+            schedule_script(name)
+    return order
+
+def schedule_script(name):
+    """Schedules a script whose dependencies have all started to launch after its delay."""
+    launch_times[name] = time.time() + scripts_by_name[name].get("delay_start", 0)
+
 def start_script(script_info):
     """
-    Starts a script if its dependencies are met and it's ready to start.
+    Starts a pending script whose dependencies have started and schedules any
+    dependents that become ready as a result.
     Returns True if the script was started or is already running, False otherwise.
     """
     name = script_info["name"]
@@ -56,55 +125,118 @@ def start_script(script_info):
     if script_states[name] == "running":
         print(f"{name} is already running")
         return True
-        
-    # Check if dependencies are met
-    dependencies_met = all(
-        script_states.get(dep, "stopped") == "running" or script_states.get(dep, "stopped") == "finished"
-        for dep in script_info["dependencies"]
-    )
-    
-    # Check if it's time to start the script based on delay
-    current_time = time.time()
-    if name not in start_times:
-        start_times[name] = current_time
-    ready_to_start = (current_time - start_times[name]) >= script_info.get("delay_start", 0)
-    
-    if script_states[name] == "pending" and dependencies_met and ready_to_start:
+
+    if script_states[name] == "pending":
         print(f"Starting {name}...")
         try:
             # For drift_detector, redirect output to log file
             if name == "drift_detector":
-                with open("generated_files/drift_detector_output.log", "a") as log_file:
+                # drift_detector writes its messages to this file through its own log
+                # handler; only stray output such as tracebacks arrives via stdout/stderr.
+                # O_APPEND makes each write land at the current end of the file, so the
+                # two writers can share it safely
+                log_fd = os.open(
+                    "generated_files/drift_detector_output.log",
+                    os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                    0o644,
+                )
+                env = dict(os.environ, PYTHONIOENCODING="utf-8")
+                try:
                     process = subprocess.Popen(
                         command,
-                        stdout=log_file,
-                        stderr=subprocess.STDOUT
+                        stdout=log_fd,
+                        stderr=subprocess.STDOUT,
+                        env=env,
                     )
+                finally:
+                    os.close(log_fd)
             else:
                 # For others, start normally
                 process = subprocess.Popen(command)
                 
             processes[name] = process
             script_states[name] = "running"
+            write_pid_file(name, process.pid)
             print(f"{name} started with PID: {process.pid}")
-            return True
         except Exception as e:
             print(f"Failed to start {name}: {e}")
             script_states[name] = "failed"
             return False
+
+        # A started dependency counts as met, even if it later finishes
+        for child in dependents[name]:
+            unstarted_dependencies[child] -= 1
+            if unstarted_dependencies[child] == 0:
+                schedule_script(child)
+        return True
     return False
 
+def start_due_scripts():
+    """
+    Starts every scheduled script whose delay has elapsed.
+    Returns the number of seconds until the next scheduled launch, or None if none are left.
+    """
+    while launch_times:
+        name, launch_time = min(launch_times.items(), key=lambda item: item[1])
+        wait = launch_time - time.time()
+        if wait > 0:
+            return wait
+        del launch_times[name]
+        start_script(scripts_by_name[name])
+    return None
+
+def record_exit(name, returncode):
+    """Updates the state of a script that has exited."""
+    processes.pop(name)
+    remove_pid_file(name)
+    if returncode == 0:
+        print(f"{name} finished successfully")
+        script_states[name] = "finished"
+    else:
+        print(f"{name} exited with error code {returncode}")
+        script_states[name] = "failed"
+
 def check_script_status():
-    """Checks the status of all running scripts and updates their states."""
-    for name, process in list(processes.items()):
-        if process.poll() is not None:
-            if process.returncode == 0:
-                print(f"{name} finished successfully")
-                script_states[name] = "finished"
-            else:
-                print(f"{name} exited with error code {process.returncode}")
-                script_states[name] = "failed"
-            processes.pop(name)
+    """Reaps all exited scripts and updates their states."""
+    if not CHILD_SIGNALS_SUPPORTED:
+        for name, process in list(processes.items()):
+            if process.poll() is not None:
+                record_exit(name, process.returncode)
+        return
+
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break  # No children left
+        if pid == 0:
+            break  # Remaining children are still running
+
+        name = next((name for name, process in processes.items() if process.pid == pid), None)
+        if name is None:
+            continue
+        # Record the exit status on the Popen object, since it was reaped here
+        processes[name].returncode = os.waitstatus_to_exitcode(status)
+        record_exit(name, processes[name].returncode)
+
+def wait_for_child_exit(timeout=None):
+    """
+    Blocks until a child process exits, a signal arrives, or the timeout elapses.
+    A timeout of None waits indefinitely. Without SIGCHLD this sleeps for at most
+    POLL_INTERVAL_SECONDS so that exits are noticed by polling.
+    """
+    if not CHILD_SIGNALS_SUPPORTED:
+        time.sleep(POLL_INTERVAL_SECONDS if timeout is None else min(timeout, POLL_INTERVAL_SECONDS))
+        return
+
+    ready, _, _ = select.select([_wakeup_read_fd], [], [], timeout)
+    if ready:
+        # Drain the signal numbers written by the interpreter's wakeup fd
+        try:
+            while os.read(_wakeup_read_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
 
 def stop_script(script_name):
     """Stops a running script and updates its state."""
@@ -128,6 +260,7 @@ def stop_script(script_name):
             print(f"Terminated {script_name}")
             script_states[script_name] = "stopped"
             processes.pop(script_name)
+            remove_pid_file(script_name)
         except Exception as e:
             print(f"Error stopping {script_name}: {e}")
     else:
@@ -149,6 +282,11 @@ def main():
     # Register signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+
+    # Wake the main loop when a child exits instead of polling every script
+    if CHILD_SIGNALS_SUPPORTED:
+        signal.set_wakeup_fd(_wakeup_write_fd)
+        signal.signal(signal.SIGCHLD, lambda sig, frame: None)
     
     # Ensure directories exist
     if not ensure_directories_exist():
@@ -156,28 +294,23 @@ def main():
         return
     
     print("Starting the 5G Dynamic Resource Allocation System...")
+
+    launch_order = build_launch_plan()
+    print(f"Launch order: {', '.join(launch_order)}")
+    unreachable = [script["name"] for script in scripts if script["name"] not in launch_order]
+    if unreachable:
+        print(f"Dependencies can never be met for: {', '.join(unreachable)}")
     
     # Main orchestration loop
     while True:
         # Check status of all scripts
         check_script_status()
         
-        # Try to start scripts that are waiting
-        for script_info in scripts:
-            start_script(script_info)
-        
-        # Check if all scripts are running or finished
-        all_running_or_finished = all(
-            state == "running" or state == "finished"
-            for state in script_states.values()
-        )
+        # Start scripts whose dependencies have started and whose delay has elapsed
+        next_launch_in = start_due_scripts()
         
-        if all_running_or_finished:
-            # If all scripts are running or finished, just monitor them
-            time.sleep(5)
-        else:
-            # If some scripts are still pending, check more frequently
-            time.sleep(1)
+        # Sleep until the next scheduled launch, or until a script exits if none are left
+        wait_for_child_exit(timeout=next_launch_in)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,8 +1,9 @@
 # processor.py
-import json
+import io
 import time
 import os
-from datetime import datetime
+import numpy as np
+import orjson
 import pandas as pd
 
 
@@ -10,63 +11,131 @@ import pandas as pd
 INPUT_FILENAME = "generated_files/network_data.log"
 OUTPUT_FILENAME = "generated_files/processed_features.csv"
 
+# Fields expected in each network data record, and the features written out
+RAW_COLUMNS = [
+    "timestamp", "cell_id", "resource_blocks_total", "resource_blocks_used",
+    "latency_ms", "throughput_mbps", "active_users",
+]
+REQUIRED_COLUMNS = ["timestamp", "resource_blocks_total", "resource_blocks_used"]
+NUMERIC_COLUMNS = [
+    "resource_blocks_total", "resource_blocks_used", "latency_ms", "throughput_mbps", "active_users",
+]
+FEATURE_COLUMNS = [
+    "timestamp", "cell_id", "latency_ms", "throughput_mbps", "active_users",
+    "resource_block_utilization_percent",
+]
+# Narrow types for the features; values fit comfortably and arithmetic is unchanged
+FEATURE_DTYPES = {
+    "cell_id": "category",
+    "latency_ms": "float32",
+    "throughput_mbps": "float32",
+    "active_users": "Int32",
+    "resource_block_utilization_percent": "float32",
+}
+
+# Read position in the input log and whether the output CSV has been started
+_state = {"offset": 0, "header_written": False}
+
 # Ensure the output directory exists
 OUTPUT_DIR = "generated_files"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
 def read_and_process_data(input_filename=INPUT_FILENAME, output_filename=OUTPUT_FILENAME):
-    """Reads data from the log file, processes it, and saves features to a CSV file."""
-    processed_data = []
-    
+    """Reads new data appended to the log file, processes it, and appends features to a CSV file."""
     try:
         # Check if input file exists before trying to read
         if not os.path.exists(input_filename):
             print(f"Input file {input_filename} not found. Waiting for data...")
             return
-            
-        with open(input_filename, "r") as f:
-            for line in f:
+
+        if os.path.getsize(input_filename) < _state["offset"]:
+            # The log was truncated or rotated, rebuild the features from scratch
+            print(f"Input file {input_filename} shrank. Reprocessing from the start.")
+            _state["offset"] = 0
+            _state["header_written"] = False
+
+        # Only read the records appended since the last pass
+        with open(input_filename, "rb") as f:
+            f.seek(_state["offset"])
+            raw = f.read()
+
+        # Ignore a partially written last record; it is picked up on the next pass
+        raw = raw[:raw.rfind(b"\n") + 1]
+        if not raw.strip():
+            print("No new data to process.")
+            return
+        new_offset = _state["offset"] + len(raw)
+
+        text = raw.decode("utf-8", errors="replace")
+        try:
+            df = pd.read_json(io.StringIO(text), lines=True, dtype=False, convert_dates=False)
+        except ValueError:
+            # A malformed line fails the whole batch; parse line by line and keep the good records
+            records = []
+            for line in text.splitlines():
                 try:
-                    data = json.loads(line.strip())
-                    timestamp = data.get("timestamp")
-                    resource_blocks_total = data.get("resource_blocks_total")
-                    resource_blocks_used = data.get("resource_blocks_used")
-
-                    if all([timestamp, resource_blocks_total, resource_blocks_used]):
-                        utilization_percent = (resource_blocks_used / resource_blocks_total) * 100
-                        features = {
-                            "timestamp": timestamp,
-                            "cell_id": data.get("cell_id"),
-                            "latency_ms": data.get("latency_ms"),
-                            "throughput_mbps": data.get("throughput_mbps"),
-                            "active_users": data.get("active_users"),
-                            "resource_block_utilization_percent": utilization_percent
-                        }
-                        processed_data.append(features)
-                    else:
-                        print(f"Skipping incomplete data: {line.strip()}")
-                except json.JSONDecodeError:
-                    print(f"Error decoding JSON: {line.strip()}")
-                except Exception as e:
-                    print(f"An error occurred: {e}")
-
-        if processed_data:
-            # Save processed data to CSV
-            df = pd.DataFrame(processed_data)
-            
+                    record = orjson.loads(line)
+                    if isinstance(record, dict):
+                        records.append(record)
+                except orjson.JSONDecodeError:
+                    if line.strip():
+                        print(f"Error decoding JSON: {line.strip()}")
+            df = pd.DataFrame(records)
+        df = df.reindex(columns=RAW_COLUMNS)
+
+        # Coerce numeric fields so one bad value drops its record instead of failing the batch.
+        # A value that is present but not a number (or a fractional user count) makes the
+        # record invalid; a missing optional value is kept as empty.
+        invalid = pd.Series(False, index=df.index)
+        for col in NUMERIC_COLUMNS:
+            coerced = pd.to_numeric(df[col], errors="coerce")
+            invalid |= coerced.isna() & df[col].notna()
+            df[col] = coerced
+        active_users = df["active_users"]
+        invalid |= active_users.notna() & (
+            (active_users % 1 != 0) | (active_users.abs() > np.iinfo(np.int32).max)
+        )
+        # Nested values in the text fields cannot be written out or used as a category
+        for col in ("timestamp", "cell_id"):
+            invalid |= df[col].map(lambda value: isinstance(value, (dict, list)))
+
+        record_count = len(df)
+        df = df[~invalid].dropna(subset=REQUIRED_COLUMNS)
+        # Records without resource blocks have no meaningful utilization
+        df = df[df["resource_blocks_total"] != 0]
+        if len(df) < record_count:
+            print(f"Skipping {record_count - len(df)} incomplete records.")
+
+        if not df.empty:
+            # Single-precision vector arithmetic; the result is stored as float32 anyway
+            used = df["resource_blocks_used"].to_numpy(np.float32)
+            total = df["resource_blocks_total"].to_numpy(np.float32)
+            df = df.assign(resource_block_utilization_percent=used * np.float32(100.0) / total)
+            df = df[FEATURE_COLUMNS].astype(FEATURE_DTYPES)
+
             # Save a copy for use as initial baseline data
             if not os.path.exists("generated_files/initial_features.csv"):
                 df.to_csv("generated_files/initial_features.csv", index=False)
                 print("Initial baseline data saved.")
-                
-            df.to_csv(output_filename, index=False)
-            print(f"Processed features saved to {output_filename}")
+
+            # Start a fresh file on the first pass, then append only new rows
+            if _state["header_written"]:
+                df.to_csv(output_filename, mode="a", header=False, index=False)
+            else:
+                df.to_csv(output_filename, index=False)
+                _state["header_written"] = True
+            print(f"Appended {len(df)} processed features to {output_filename}")
         else:
             print("No valid data processed.")
-            
+
+        _state["offset"] = new_offset
+
     except Exception as e:
-        print(f"Error in processing data: {e}")
+        # Bad records are dropped above, so a failure here is not caused by the data
+        # (e.g. the output CSV could not be written). The offset is left unchanged and
+        # the same chunk is retried on the next pass.
+        print(f"Error in processing data, retrying on the next pass: {e}")
 
 
 def main():
@@ -1,81 +1,194 @@
 #producer.py
-import json
+import orjson
 import time
 import random
 import os
-from datetime import datetime
+import sys
+import mmap
+import atexit
+import signal
+import numpy as np
 
 
 # Ensure the output directory exists
 OUTPUT_DIR = "generated_files"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+OUTPUT_FILENAME = f"{OUTPUT_DIR}/network_data.log"
 
+# Records are buffered and written together once either limit is reached
+FLUSH_BATCH_SIZE = 32
+FLUSH_INTERVAL_SECONDS = 1.0
+DEBUG = False  # Print every flush to stdout
 
-def generate_network_data(phase):
-    """Generates synthetic network performance data with simulated drift."""
-    timestamp = datetime.utcnow().isoformat() + 'Z'
-    cell_id = f"Cell-{random.randint(1, 10)}"
-    resource_blocks_total = 100
-
-    if phase < 500:
-        # Initial phase: Baseline data distribution
-        resource_blocks_used = random.randint(10, 90)
-        latency_ms = round(random.uniform(5, 50), 2)
-        throughput_mbps = round(random.uniform(10, 500), 2)
-        active_users = random.randint(50, 500)
-    elif 500 <= phase < 1000:
-        # Phase 2: Data Drift - Increase in latency and decrease in throughput
-        resource_blocks_used = random.randint(30, 95)  # Slightly higher usage
-        latency_ms = round(random.uniform(20, 80), 2)
-        throughput_mbps = round(random.uniform(5, 200), 2)
-        active_users = random.randint(100, 600)
-    elif 1000 <= phase < 1500:
-        # Phase 3: Concept Drift - Relationship between active users and latency changes
-        # Higher active users now lead to significantly higher latency
-        resource_blocks_used = random.randint(20, 80)
-        active_users = random.randint(150, 700)
-        base_latency = round(random.uniform(10, 40), 2)
-        latency_ms = base_latency + (active_users / 10)  # Latency influenced by active users
-        throughput_mbps = round(random.uniform(20, 400), 2)
-    else:
-        # Phase 4: Combined Drift - Return to a different data distribution and concept
-        resource_blocks_used = random.randint(5, 60) # Lower usage again
-        latency_ms = round(random.uniform(15, 65), 2) # Medium latency
-        throughput_mbps = round(random.uniform(150, 650), 2) # Higher throughput
-        active_users = random.randint(20, 300) # Lower active users, lower latency
-
-    data = {
-        "timestamp": timestamp,
-        "cell_id": cell_id,
-        "resource_blocks_total": resource_blocks_total,
-        "resource_blocks_used": resource_blocks_used,
-        "latency_ms": latency_ms,
-        "throughput_mbps": throughput_mbps,
-        "active_users": active_users
-    }
-    return json.dumps(data)
-
-
-def write_to_local_file(data, filename="generated_files/network_data.log"):
-    """Writes the generated data to a local file."""
+# Records' numeric fields are drawn this many at a time
+GENERATION_BATCH_SIZE = 32
+_rng = np.random.default_rng()
+
+# Simulated drift phases start at these record counts
+PHASE_BOUNDARIES = [500, 1000, 1500]
+# Inclusive (low, high) range of each field per phase:
+# baseline, data drift (higher latency, lower throughput),
+# concept drift (latency driven by active users), combined drift
+RESOURCE_BLOCKS_USED_RANGES = [(10, 90), (30, 95), (20, 80), (5, 60)]
+LATENCY_MS_RANGES = [(5, 50), (20, 80), (10, 40), (15, 65)]
+THROUGHPUT_MBPS_RANGES = [(10, 500), (5, 200), (20, 400), (150, 650)]
+ACTIVE_USERS_RANGES = [(50, 500), (100, 600), (150, 700), (20, 300)]
+
+# Second the cached timestamp prefix was formatted for
+_timestamp_cache = {"second": None, "prefix": ""}
+
+# Write records through a memory-mapped, pre-sized file instead of write() calls.
+# Off by default: until shutdown the file is zero-padded past the last record,
+# so readers that treat the file size as the end of the data must stop at the
+# last newline.
+USE_MMAP = False
+MMAP_SEGMENT_BYTES = 1 << 20  # The mapping grows by this much when it fills up
+
+
+def generate_batch(phase_start, k=GENERATION_BATCH_SIZE):
+    """Draws the numeric fields of k consecutive records, with simulated drift, in one vectorised pass."""
+    phase = np.arange(phase_start, phase_start + k)
+    # 0: baseline, 1: data drift, 2: concept drift, 3: combined drift
+    segment = np.searchsorted(PHASE_BOUNDARIES, phase, side="right")
+
+    def bounds(table):
+        low, high = np.asarray(table).T
+        return low[segment], high[segment]
+
+    low, high = bounds(RESOURCE_BLOCKS_USED_RANGES)
+    resource_blocks_used = _rng.integers(low, high + 1)
+    low, high = bounds(ACTIVE_USERS_RANGES)
+    active_users = _rng.integers(low, high + 1)
+    low, high = bounds(LATENCY_MS_RANGES)
+    latency_ms = _rng.uniform(low, high).round(2)
+    # In the concept drift phase higher active users lead to significantly higher latency
+    latency_ms = np.where(segment == 2, latency_ms + active_users / 10, latency_ms)
+    low, high = bounds(THROUGHPUT_MBPS_RANGES)
+    throughput_mbps = _rng.uniform(low, high).round(2)
+    cell_ids = _rng.integers(1, 11, size=k)
+
+    return [
+        {
+            "cell_id": f"Cell-{cell}",
+            "resource_blocks_total": 100,
+            "resource_blocks_used": used,
+            "latency_ms": latency,
+            "throughput_mbps": throughput,
+            "active_users": users,
+        }
+        for cell, used, latency, throughput, users in zip(
+            cell_ids.tolist(), resource_blocks_used.tolist(), latency_ms.tolist(),
+            throughput_mbps.tolist(), active_users.tolist(),
+        )
+    ]
+
+
+def utc_timestamp():
+    """Returns the current UTC time as an ISO-8601 string, e.g. "2024-01-01T12:00:00.123456Z"."""
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    # Only format the date and time once per second; records within it reuse the prefix
+    if seconds != _timestamp_cache["second"]:
+        _timestamp_cache["second"] = seconds
+        _timestamp_cache["prefix"] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+    return f"{_timestamp_cache['prefix']}.{nanoseconds // 1000:06d}Z"
+
+
+def generate_network_data(fields):
+    """Stamps a record drawn by generate_batch with the current time and serialises it."""
+    data = {"timestamp": utc_timestamp()}
+    data.update(fields)
+    return orjson.dumps(data)
+
+
+class MmapLog:
+    """Append-only log file written through a memory map that grows in fixed segments."""
+
+    def __init__(self, filename, segment_bytes=MMAP_SEGMENT_BYTES):
+        self.name = filename
+        self.segment_bytes = segment_bytes
+        self.file = open(filename, "a+b")
+        # Continue after the last complete record. After an unclean exit the file
+        # still ends in zero padding (or a partial record), which is overwritten.
+        self.cursor = 0
+        size = os.path.getsize(filename)
+        if size:
+            with mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ) as existing:
+                self.cursor = existing.rfind(b"\n") + 1
+        self.mm = None
+        self._remap(self.cursor + segment_bytes)
+
+    def _remap(self, size):
+        if self.mm is not None:
+            self.mm.close()
+        self.file.truncate(size)
+        self.size = size
+        self.mm = mmap.mmap(self.file.fileno(), size)
+
+    def write(self, data):
+        end = self.cursor + len(data)
+        if end > self.size:
+            self._remap(end + self.segment_bytes)
+        self.mm[self.cursor:end] = data
+        self.cursor = end
+
+    def flush(self):
+        # Nothing to do: the OS writes dirty pages back to the file asynchronously
+        pass
+
+    def close(self):
+        if self.mm is None:
+            return
+        self.mm.flush()
+        self.mm.close()
+        self.mm = None
+        # Drop the unused, zero-filled tail of the last segment
+        self.file.truncate(self.cursor)
+        self.file.close()
+
+
+def write_to_local_file(f, buffer):
+    """Writes the buffered records to the open data file in a single write."""
+    if not buffer:
+        return
+    # Take the records out of the buffer first, so a SystemExit during the write
+    # cannot make the atexit flush write them a second time
+    count = len(buffer)
+    data = b"".join(buffer)
+    buffer.clear()
     try:
-        with open(filename, "a") as f:
-            f.write(data + "\n")
-        print(f"Data written to {filename}: {data}")
+        f.write(data)
+        f.flush()
+        if DEBUG:
+            print(f"{count} records written to {f.name}")
     except Exception as e:
-        print(f"Error writing to file {filename}: {e}")
+        print(f"Error writing to file {f.name}: {e}")
 
 
 def main():
     """Main function to generate and write network data with simulated drift."""
+    if USE_MMAP:
+        f = MmapLog(OUTPUT_FILENAME)
+    else:
+        f = open(OUTPUT_FILENAME, "ab", buffering=1 << 16)
+    buffer = []
+    # Flush whatever is still buffered on shutdown (registered last, runs first)
+    atexit.register(f.close)
+    atexit.register(write_to_local_file, f, buffer)
+
     phase = 0
+    last_flush = time.time()
     while True:
-        network_data = generate_network_data(phase)
-        write_to_local_file(network_data)
-        time.sleep(random.uniform(0.5, 2))  # Simulate data generation frequency
-        phase += 1
+        for fields in generate_batch(phase):
+            buffer.append(generate_network_data(fields) + b"\n")
+            if len(buffer) >= FLUSH_BATCH_SIZE or time.time() - last_flush >= FLUSH_INTERVAL_SECONDS:
+                write_to_local_file(f, buffer)
+                last_flush = time.time()
+            time.sleep(random.uniform(0.5, 2))  # Simulate data generation frequency
+            phase += 1
 
 
 if __name__ == "__main__":
     print("Network data producer started.")
+    # Exit normally on SIGTERM from the orchestrator so buffered records are flushed
+    signal.signal(signal.SIGTERM, lambda sig, frame: sys.exit(0))
     main()
@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
 import time
-import json
+import io
+import orjson
 import re
 from datetime import datetime
 import os
-import subprocess
+import mmap
+import psutil
+from collections import deque
 
 # Configuration Files
 PREDICTIONS_LOG_FILENAME = "generated_files/predictions.log"
@@ -21,14 +24,29 @@ DEFAULT_CONCEPT_DRIFT_MSE_THRESHOLD = 10.0
 DEFAULT_HIGH_UTILIZATION_THRESHOLD = 85.0
 DEFAULT_LOW_UTILIZATION_THRESHOLD = 30.0
 
+# Initial number of bytes read from the end of a log when showing its last lines
+TAIL_BLOCK_SIZE = 64 * 1024
+
+def tail_last_line(filename):
+    """Returns the last line of a file by scanning backwards from its end, or None if it is empty."""
+    size = os.path.getsize(filename)
+    if size == 0:
+        return None
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            end = size
+            if mm[end - 1] == ord("\n"):
+                end -= 1
+            start = mm.rfind(b"\n", 0, end) + 1
+            return mm[start:end].decode("utf-8", errors="replace")
+
 def load_latest_data(filename, parser_function=lambda x: x):
     try:
         if not os.path.exists(filename):
             return None
-        with open(filename, "r") as f:
-            lines = f.readlines()
-            if lines:
-                return parser_function(lines[-1].strip())
+        line = tail_last_line(filename)
+        if line is not None:
+            return parser_function(line.strip())
     except Exception as e:
         st.error(f"Error loading data from {filename}: {e}")
         return None
@@ -36,8 +54,8 @@ def load_latest_data(filename, parser_function=lambda x: x):
 
 def parse_network_data(line):
     try:
-        return json.loads(line)
-    except json.JSONDecodeError:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
         return None
 
 def get_latest_prediction():
@@ -54,25 +72,73 @@ def get_latest_alert():
 def get_latest_allocation():
     return load_latest_data(ALLOCATION_LOG_FILENAME)
 
+def tail_lines(filename, max_lines, block_size=TAIL_BLOCK_SIZE):
+    """
+    Returns up to the last max_lines lines of a file, reading backwards from its end
+    in blocks that double in size until enough lines are found.
+    """
+    with open(filename, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        back = min(size, block_size)
+        while True:
+            f.seek(size - back)
+            lines = f.read(back).decode("utf-8", errors="replace").splitlines()
+            if back < size:
+                lines = lines[1:]  # The first line may have been cut off
+            if len(lines) >= max_lines or back == size:
+                return lines[-max_lines:]
+            back = min(size, back * 2)
+
+def update_log_buffer(filename, log_state):
+    """
+    Appends the complete lines written to a log since the last refresh to its buffer.
+    The first refresh only reads the last TAIL_BLOCK_SIZE bytes of the file.
+    """
+    with open(filename, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if log_state["offset"] is not None and size < log_state["offset"]:
+            # The log was truncated or rotated, start again from its tail
+            log_state["offset"] = None
+            log_state["lines"].clear()
+        first_read = log_state["offset"] is None
+        start = max(0, size - TAIL_BLOCK_SIZE) if first_read else log_state["offset"]
+        f.seek(start)
+        data = f.read(size - start)
+
+    # Leave a partially written last line for the next refresh
+    end = data.rfind(b"\n") + 1
+    lines = data[:end].decode("utf-8", errors="replace").splitlines()
+    if first_read and start > 0:
+        lines = lines[1:]  # The first line may have been cut off
+    log_state["lines"].extend(lines)
+    log_state["offset"] = start + end
+
 def read_log_file(filename, max_lines=100):
     try:
         if not os.path.exists(filename):
             return ["Log file not found."]
-        with open(filename, "r") as f:
-            lines = f.readlines()
-            return lines[-max_lines:] if lines else ["No data in log file."]
+        # Keep the last lines of each log across reruns and only read what was appended
+        log_states = st.session_state.setdefault("log_state", {})
+        log_state = log_states.get(filename)
+        if log_state is None or log_state["lines"].maxlen != max_lines:
+            log_state = {"offset": None, "lines": deque(maxlen=max_lines)}
+            log_states[filename] = log_state
+        update_log_buffer(filename, log_state)
+        lines = list(log_state["lines"])
+        return lines if lines else ["No data in log file."]
     except Exception as e:
         return [f"Error reading log file: {e}"]
 
+@st.cache_data(ttl=2, show_spinner=False)
 def is_script_running(script_name):
+    # The orchestrator writes a PID file for every script it starts
     try:
-        if os.name == 'nt':
-            tasks = subprocess.check_output(['tasklist'], creationflags=subprocess.CREATE_NO_WINDOW, text=True)
-            return f"python*{script_name}.py" in tasks
-        else:
-            processes = subprocess.check_output(['pgrep', '-f', f"{script_name}.py"], text=True)
-            return script_name in processes
-    except subprocess.CalledProcessError:
+        with open(f"generated_files/{script_name}.pid", "r") as f:
+            pid = int(f.read().strip())
+        return psutil.pid_exists(pid)
+    except (FileNotFoundError, ValueError):
         return False
     except Exception as e:
         st.error(f"Error checking script status for {script_name}: {e}")
@@ -86,18 +152,76 @@ def ensure_directories_exist():
         st.error(f"Failed to create necessary directories: {e}")
         return False
 
+@st.cache_data(max_entries=1, show_spinner=False)
+def read_features_tail(filename, mtime_ns, size, max_rows):
+    # mtime_ns and size are only part of the cache key, so a changed file is re-read
+    df = pd.read_csv(filename).tail(max_rows).copy()
+    if "timestamp" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+    return df
+
 def load_processed_features(max_rows=50):
     try:
         if not os.path.exists(PROCESSED_FEATURES_FILENAME):
             return None
-        df = pd.read_csv(PROCESSED_FEATURES_FILENAME)
+        stat = os.stat(PROCESSED_FEATURES_FILENAME)
+        df = read_features_tail(PROCESSED_FEATURES_FILENAME, stat.st_mtime_ns, stat.st_size, max_rows)
         if df.empty:
             return None
-        return df.tail(max_rows)
+        return df
     except Exception as e:
         st.error(f"Error loading processed features: {e}")
         return None
 
+@st.cache_data(max_entries=1, show_spinner=False)
+def read_network_tail(filename, mtime_ns, size, max_rows):
+    # mtime_ns and size are only part of the cache key, so a changed file is re-read
+    # One tail read serves both the latest metrics and the history chart
+    # Skip a record that is still being written; read_json rejects the whole batch otherwise
+    lines = [line for line in tail_lines(filename, max_rows) if line.rstrip().endswith("}")]
+    if not lines:
+        return None, None
+
+    try:
+        df_network_history = pd.read_json(io.StringIO("\n".join(lines)), lines=True, convert_dates=False)
+        # The newest record is the last row; use plain Python values and leave out missing fields
+        latest_network_data = {
+            key: value.item() if hasattr(value, "item") else value
+            for key, value in df_network_history.iloc[-1].items()
+            if not (pd.api.types.is_scalar(value) and pd.isna(value))
+        }
+    except ValueError:
+        # A malformed line fails the whole batch; parse line by line and keep the good records
+        historical_data = [data for data in map(parse_network_data, lines) if isinstance(data, dict)]
+        if not historical_data:
+            return None, None
+        latest_network_data = historical_data[-1]
+        df_network_history = pd.DataFrame(historical_data)
+    if not (
+        "timestamp" in df_network_history.columns and
+        "resource_blocks_used" in df_network_history.columns and
+        "resource_blocks_total" in df_network_history.columns
+    ):
+        return latest_network_data, None
+    df_network_history["utilization_percent"] = (
+        df_network_history["resource_blocks_used"].to_numpy()
+        / df_network_history["resource_blocks_total"].to_numpy()
+        * 100
+    )
+    df_network_history["timestamp"] = pd.to_datetime(df_network_history["timestamp"])
+    return latest_network_data, df_network_history
+
+def load_network_data(max_rows=50):
+    """Returns the latest network data record and a DataFrame of the last max_rows records."""
+    try:
+        if not os.path.exists(NETWORK_DATA_LOG_FILENAME):
+            return None, None
+        stat = os.stat(NETWORK_DATA_LOG_FILENAME)
+        return read_network_tail(NETWORK_DATA_LOG_FILENAME, stat.st_mtime_ns, stat.st_size, max_rows)
+    except Exception as e:
+        st.error(f"Error loading data from {NETWORK_DATA_LOG_FILENAME}: {e}")
+        return None, None
+
 def main():
     ensure_directories_exist()
 
@@ -123,7 +247,7 @@ def main():
     st.subheader("Current Network Status")
     col1, col2, col3 = st.columns(3)
 
-    latest_network_data = load_latest_data(NETWORK_DATA_LOG_FILENAME, parse_network_data)
+    latest_network_data, df_network_history = load_network_data(max_rows=50)
     if latest_network_data:
         cell_id = latest_network_data.get("cell_id", "N/A")
         resource_blocks_used = latest_network_data.get("resource_blocks_used", 0)
@@ -180,40 +304,18 @@ def main():
 
     with tab1:
         try:
-            historical_data = []
-            with open(NETWORK_DATA_LOG_FILENAME, "r") as f:
-                lines = f.readlines()
-                for line in lines[-50:]:
-                    try:
-                        data = json.loads(line.strip())
-                        historical_data.append(data)
-                    except json.JSONDecodeError:
-                        pass
-            if historical_data:
-                df_network_history = pd.DataFrame(historical_data)
-                if (
-                    "timestamp" in df_network_history.columns and
-                    "resource_blocks_used" in df_network_history.columns and
-                    "resource_blocks_total" in df_network_history.columns
-                ):
-                    df_network_history["utilization_percent"] = (
-                        df_network_history["resource_blocks_used"]
-                        / df_network_history["resource_blocks_total"]
-                        * 100
-                    )
-                    df_network_history["timestamp"] = pd.to_datetime(df_network_history["timestamp"])
-                    st.line_chart(
-                        df_network_history.set_index("timestamp")[[
-                            "utilization_percent", "latency_ms", "throughput_mbps"
-                        ]]
-                    )
+            if df_network_history is not None:
+                st.line_chart(
+                    df_network_history.set_index("timestamp")[[
+                        "utilization_percent", "latency_ms", "throughput_mbps"
+                    ]]
+                )
         except Exception as e:
             st.error(f"Error processing historical data: {e}")
 
     with tab2:
         if df_features is not None and not df_features.empty:
             if "timestamp" in df_features.columns:
-                df_features["timestamp"] = pd.to_datetime(df_features["timestamp"])
                 df_features = df_features.set_index("timestamp")
 
             if "resource_block_utilization_percent" in df_features.columns: